@@ -1,12 +1,16 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 from modules.ai_agent import UnifiedAgent
+from modules.certificate_handler import process_certificate_request, fetch_certificate_package, PackageNotFoundError
 from modules.logger import setup_logger
+from modules import metrics
+from modules.profiler import SamplingProfiler
 from config import Config
 
 app = Flask(__name__)
 CORS(app)
 logger = setup_logger()
+metrics.init_app(app, profiler=SamplingProfiler())
 
 # Initialize unified agent
 agent = UnifiedAgent()
@@ -77,6 +81,40 @@ def reset_conversation():
         logger.error(f"Error resetting conversation: {str(e)}")
         return jsonify({'error': 'Failed to reset conversation'}), 500
 
+@app.route('/api/certificates/<package_id>', methods=['POST'])
+def upload_certificate_package(package_id):
+    """Store the uploaded files as a certificate package."""
+    try:
+        files = request.files.getlist('files')
+        if not files:
+            return jsonify({'error': 'No files provided'}), 400
+        package = process_certificate_request(package_id, [(f.filename, f.stream) for f in files])
+        return jsonify(package), 201
+    except ValueError as ve:
+        return jsonify({'error': str(ve)}), 400
+    except Exception as e:
+        logger.error(f"Error storing certificate package: {str(e)}")
+        return jsonify({'error': 'Failed to store certificate package'}), 500
+
+@app.route('/api/certificates/<package_id>', methods=['GET'])
+def download_certificate_package(package_id):
+    """Download a certificate package as a zip."""
+    try:
+        # send_file opens the zip before the block exits, so eviction cannot remove it mid-download
+        with fetch_certificate_package(package_id) as zip_path:
+            return send_file(zip_path, mimetype='application/zip', as_attachment=True,
+                             download_name=f"{package_id}.zip")
+    except (ValueError, PackageNotFoundError):
+        return jsonify({'error': 'Certificate package not found'}), 404
+    except Exception as e:
+        logger.error(f"Error fetching certificate package: {str(e)}")
+        return jsonify({'error': 'Failed to fetch certificate package'}), 500
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Expose metrics in Prometheus text format."""
+    return Response(metrics.render_metrics(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
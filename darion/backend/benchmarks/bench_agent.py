@@ -0,0 +1,63 @@
+"""
+UnifiedAgent.process_query routing against local fakes.
+
+Run from darion/backend:
+    python -m benchmarks.bench_agent --queries 500 --openai-latency-ms 50
+"""
+import argparse
+import time
+from collections import Counter
+from typing import Dict, Any
+from modules.ai_agent import UnifiedAgent
+from .common import Timer, summarize, add_output_arguments, report
+from .fakes import (FAILURE_MARKERS, fake_services, request_counts, check_fakes_hit,
+                    add_latency_arguments, latency_from_args)
+
+# One query per routing branch: file sorting, each sync intent, and the LLM fallback,
+# with the fakes each must hit; process_query swallows errors, so without these
+# checks a broken fake would be measured as a fast query
+QUERIES = [
+    ('sort my files by type', ('openai',)),
+    ('sync outlook', ('openai', 'graph')),
+    ('sync onedrive', ('openai', 'graph')),
+    ('sync gmail', ('openai',)),
+    ('sync calendar', ('openai', 'timetree')),
+    ('sync all', ('openai', 'graph', 'timetree')),
+    ('what can you help me with?', ('openai',)),
+]
+
+
+def run(queries: int, latency: Dict[str, float], items: int = 25) -> Dict[str, Any]:
+    """Cycle through QUERIES, timing each process_query call."""
+    expected: Counter = Counter()
+    with fake_services(latency, items) as servers:
+        agent = UnifiedAgent()
+        before = request_counts(servers)
+        timer = Timer()
+        start = time.perf_counter()
+        for i in range(queries):
+            query, fakes = QUERIES[i % len(QUERIES)]
+            with timer:
+                response = agent.process_query(query)
+            if any(marker in response for marker in FAILURE_MARKERS):
+                raise RuntimeError(f"process_query({query!r}) failed: {response}")
+            expected.update(fakes)
+        elapsed = time.perf_counter() - start
+        for name, minimum in expected.items():
+            check_fakes_hit(servers, before, (name,), minimum, 'process_query')
+
+    return summarize('ai_agent.process_query', timer.latencies, queries, elapsed,
+                     {'queries': queries, 'latency': latency, 'items': items})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark UnifiedAgent.process_query routing')
+    parser.add_argument('--queries', type=int, default=500)
+    add_latency_arguments(parser)
+    add_output_arguments(parser)
+    args = parser.parse_args()
+    report([run(args.queries, latency_from_args(args), args.items)], args.json_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Billing throughput benchmark.
+
+Run from darion/backend:
+    python -m benchmarks.bench_billing --documents 5000 --lines 10
+"""
+import argparse
+import tempfile
+from typing import Dict, Any, Iterator
+from modules.billing import BillingEngine
+from .common import summarize, add_output_arguments, report
+
+
+def synthetic_lines(documents: int, lines_per_document: int) -> Iterator[Dict[str, Any]]:
+    """Yield line items for synthetic documents, grouped by document number."""
+    for number in range(1, documents + 1):
+        for line in range(lines_per_document):
+            yield {
+                'document_number': number,
+                'party': f"Customer {number % 97}",
+                'date': '2024-01-31',
+                'description': f"Item {line}",
+                'quantity': line + 1,
+                'unit_price': 9.99 + line,
+                'tax_rate': 0.08,
+            }
+
+
+def run(documents: int, lines_per_document: int, doc_type: str, output_format: str,
+        workers: int = None, batch_size: int = None) -> Dict[str, Any]:
+    """Generate synthetic documents into a temporary directory."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        engine = BillingEngine(output_dir=output_dir, workers=workers, batch_size=batch_size)
+        result = engine.generate_documents(doc_type, synthetic_lines(documents, lines_per_document), output_format)
+    if not result['success']:
+        raise RuntimeError(result['message'])
+    stats = result['statistics']
+    # Rendering is batched across processes, so latencies are per batch, timed in the worker
+    return summarize(f"billing.{doc_type}[{output_format}]", stats['batch_seconds'],
+                     stats['documents'], stats['elapsed_seconds'],
+                     {'documents': documents, 'lines_per_document': lines_per_document,
+                      'workers': engine.workers, 'batch_size': engine.batch_size},
+                     child_processes=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark billing document generation')
+    parser.add_argument('--documents', type=int, default=5000)
+    parser.add_argument('--lines', type=int, default=10)
+    parser.add_argument('--type', dest='doc_type', default='invoice')
+    parser.add_argument('--format', dest='output_format', default='html')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=None)
+    add_output_arguments(parser)
+    args = parser.parse_args()
+
+    report([run(args.documents, args.lines, args.doc_type, args.output_format,
+                args.workers, args.batch_size)], args.json_path)
+
+
+if __name__ == '__main__':
+    main()
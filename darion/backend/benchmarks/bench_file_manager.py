@@ -0,0 +1,79 @@
+"""
+FileManager.sort_files on synthetic trees.
+
+Run from darion/backend:
+    python -m benchmarks.bench_file_manager --files 10000 100000 1000000
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, Any, List
+from modules.file_manager import FileManager
+from .common import MIN_PERCENTILE_SAMPLES, Timer, summarize, add_output_arguments, report
+
+FILES_PER_DIR = 1000
+
+# Small payloads with real magic numbers so type detection sees a realistic mix
+PAYLOADS = [
+    ('.txt', b'plain text content\n'),
+    ('.pdf', b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n'),
+    ('.png', b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR'),
+    ('.zip', b'PK\x03\x04\x14\x00\x00\x00'),
+    ('.csv', b'a,b,c\n1,2,3\n'),
+]
+
+
+def build_tree(root: str, files: int) -> None:
+    """Create a tree of small files spread over FILES_PER_DIR-sized directories."""
+    for i in range(files):
+        directory = os.path.join(root, f"dir_{i // FILES_PER_DIR:05d}")
+        if i % FILES_PER_DIR == 0:
+            os.makedirs(directory, exist_ok=True)
+        ext, payload = PAYLOADS[i % len(PAYLOADS)]
+        with open(os.path.join(directory, f"file_{i}{ext}"), 'wb') as f:
+            f.write(payload)
+
+
+def run(files: int, criteria: str = 'type', iterations: int = 1) -> Dict[str, Any]:
+    """Sort a fresh synthetic tree per iteration; tree creation is not timed."""
+    manager = FileManager()
+    timer = Timer()
+    elapsed = 0.0
+    for _ in range(iterations):
+        work_dir = tempfile.mkdtemp(prefix='darion-bench-')
+        try:
+            source_dir = os.path.join(work_dir, 'source')
+            build_tree(source_dir, files)
+            start = time.perf_counter()
+            with timer:
+                result = manager.sort_files(source_dir, os.path.join(work_dir, 'sorted'), criteria)
+            elapsed += time.perf_counter() - start
+            if not result['success']:
+                raise RuntimeError(result['message'])
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return summarize(f"file_manager.sort_files[{criteria},{files}]", timer.latencies,
+                     files * iterations, elapsed,
+                     {'files': files, 'criteria': criteria, 'iterations': iterations})
+
+
+def run_all(sizes: List[int], criteria: str = 'type', iterations: int = 1) -> List[Dict[str, Any]]:
+    return [run(files, criteria, iterations) for files in sizes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark FileManager.sort_files')
+    parser.add_argument('--files', type=int, nargs='+', default=[10000])
+    parser.add_argument('--criteria', default='type')
+    parser.add_argument('--iterations', type=int, default=1,
+                        help=f"Trees sorted per size; p50/p99 need at least {MIN_PERCENTILE_SAMPLES}")
+    add_output_arguments(parser)
+    args = parser.parse_args()
+    report(run_all(args.files, args.criteria, args.iterations), args.json_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Load test for the /api/sync/* endpoints and the Gmail integration against local fakes.
+
+Run from darion/backend:
+    python -m benchmarks.bench_sync --requests 200 --concurrency 8 --graph-latency-ms 80
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+from google.oauth2.credentials import Credentials
+from modules.ai_agent import UnifiedAgent
+from modules.integrations import GmailIntegration
+from .common import Timer, summarize, add_output_arguments, report
+from .fakes import (FakeServer, FAILURE_MARKERS, fake_services, request_counts, check_fakes_hit,
+                    add_latency_arguments, latency_from_args)
+
+ENDPOINTS = ['/api/sync/outlook', '/api/sync/onedrive', '/api/sync/timetree', '/api/sync/all']
+TARGETS = ENDPOINTS + ['gmail']
+
+# Fakes each endpoint must hit on every request; the handlers swallow integration
+# errors and still return 200, so this is what proves the happy path was measured
+EXPECTED_FAKES = {
+    '/api/sync/outlook': ('openai', 'graph'),
+    '/api/sync/onedrive': ('openai', 'graph'),
+    '/api/sync/timetree': ('openai', 'timetree'),
+    '/api/sync/all': ('openai', 'graph', 'timetree'),
+}
+
+
+def _load(app, servers: Dict[str, FakeServer], path: str, requests: int, concurrency: int) -> Dict[str, Any]:
+    """Issue requests against one endpoint from concurrent clients."""
+    def worker(count: int) -> List[float]:
+        client = app.test_client()
+        timer = Timer()
+        for _ in range(count):
+            with timer:
+                response = client.get(path)
+            body = response.get_json(silent=True) or {}
+            message = str(body.get('response', ''))
+            if response.status_code != 200 or any(marker in message for marker in FAILURE_MARKERS):
+                raise RuntimeError(f"{path} returned {response.status_code}: {body}")
+        return timer.latencies
+
+    before = request_counts(servers)
+
+    shares = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = [latency for result in executor.map(worker, shares) for latency in result]
+    elapsed = time.perf_counter() - start
+    check_fakes_hit(servers, before, EXPECTED_FAKES[path], requests, f"GET {path}")
+    return summarize(f"GET {path}", latencies, requests, elapsed,
+                     {'requests': requests, 'concurrency': concurrency})
+
+
+def _gmail(servers: Dict[str, FakeServer], iterations: int) -> Dict[str, Any]:
+    """Time GmailIntegration.get_gmail_data, which no sync endpoint calls yet."""
+    gmail = GmailIntegration(Credentials(token='fake-token'), api_endpoint=f"{servers['gmail'].url}/")
+    before = request_counts(servers)
+    timer = Timer()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with timer:
+            gmail.get_gmail_data()
+    elapsed = time.perf_counter() - start
+    check_fakes_hit(servers, before, ('gmail',), iterations, 'get_gmail_data')
+    return summarize('integrations.get_gmail_data', timer.latencies, iterations, elapsed,
+                     {'iterations': iterations})
+
+
+def run(requests: int, concurrency: int, latency: Dict[str, float], items: int = 25,
+        targets: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    targets = targets or TARGETS
+    with fake_services(latency, items) as servers:
+        # app builds its agent at import time, so import it once the fakes are in place
+        import app as darion_app
+        darion_app.agent = UnifiedAgent()
+
+        results = [_load(darion_app.app, servers, path, requests, concurrency)
+                   for path in ENDPOINTS if path in targets]
+        if 'gmail' in targets:
+            results.append(_gmail(servers, max(requests // 10, 1)))
+
+    for result in results:
+        result['params'].update({'latency': latency, 'items': items})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the /api/sync/* endpoints')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--targets', nargs='+', choices=TARGETS, default=TARGETS)
+    add_latency_arguments(parser)
+    add_output_arguments(parser)
+    args = parser.parse_args()
+    report(run(args.requests, args.concurrency, latency_from_args(args), args.items, args.targets),
+           args.json_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+import json
+import math
+import platform
+import resource
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+
+# Fewer samples than this make p50/p99 meaningless (a single sample is its own p99),
+# so results leave them out and compare skips them
+MIN_PERCENTILE_SAMPLES = 5
+
+
+def peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    """
+    Peak resident set size so far, in MB.
+
+    This is a lifetime high-water mark, so benchmarks.run starts a fresh
+    process per benchmark. RUSAGE_CHILDREN gives the largest peak among
+    finished child processes, such as the billing worker pool.
+    """
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100.0 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize(name: str, latencies: List[float], operations: int, elapsed: float,
+              params: Optional[Dict[str, Any]] = None, child_processes: bool = False) -> Dict[str, Any]:
+    """
+    Build a benchmark result.
+
+    Args:
+        name: Unique benchmark name, used to match results between runs
+        latencies: Per-operation (or per-iteration) latencies in seconds;
+            p50/p99 are only reported with MIN_PERCENTILE_SAMPLES or more
+        operations: Units of work done, used for throughput
+        elapsed: Wall-clock seconds for the measured section
+        params: Parameters the benchmark ran with
+        child_processes: Also report peak RSS of worker processes. Only set
+            this for benchmarks that own a process pool; helpers forked by
+            library imports would otherwise show up as child memory.
+    """
+    result = {
+        'name': name,
+        'params': params or {},
+        'operations': operations,
+        'elapsed_seconds': elapsed,
+        'throughput_per_second': operations / elapsed if elapsed else 0.0,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+    if len(latencies) >= MIN_PERCENTILE_SAMPLES:
+        result['p50_ms'] = percentile(latencies, 50) * 1000
+        result['p99_ms'] = percentile(latencies, 99) * 1000
+    if child_processes:
+        result['peak_child_rss_mb'] = peak_rss_mb(resource.RUSAGE_CHILDREN)
+    return result
+
+
+class Timer:
+    """Collects latencies of repeated timed blocks."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.latencies.append(time.perf_counter() - self._start)
+        return False
+
+
+def write_results(results: List[Dict[str, Any]], path: str) -> None:
+    """Write results with enough environment info to compare runs."""
+    report = {
+        'created': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def load_results(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def add_output_arguments(parser) -> None:
+    parser.add_argument('--json', dest='json_path', help='Also write results as JSON to this path')
+
+
+def report(results: List[Dict[str, Any]], json_path: Optional[str] = None) -> None:
+    """Print results and optionally write them for benchmarks.run or compare."""
+    print_results(results)
+    if json_path:
+        write_results(results, json_path)
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """Print results as a table."""
+    header = (f"{'benchmark':<40} {'ops/s':>12} {'p50 ms':>10} {'p99 ms':>10} "
+              f"{'peak MB':>9} {'child MB':>9}")
+    print(header)
+    print('-' * len(header))
+    def optional(r: Dict[str, Any], key: str, spec: str) -> str:
+        return format(r[key], spec) if key in r else '-'
+
+    for r in results:
+        print(f"{r['name']:<40} {r['throughput_per_second']:>12.1f} {optional(r, 'p50_ms', '.2f'):>10} "
+              f"{optional(r, 'p99_ms', '.2f'):>10} {r['peak_rss_mb']:>9.1f} "
+              f"{optional(r, 'peak_child_rss_mb', '.1f'):>9}")
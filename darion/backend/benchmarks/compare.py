@@ -0,0 +1,66 @@
+"""
+Compare two benchmark result files.
+
+Run from darion/backend:
+    python -m benchmarks.compare baseline.json results.json --threshold 10
+
+Exits non-zero if any benchmark regressed by more than the threshold.
+"""
+import argparse
+import sys
+from typing import Dict, Any, List, Tuple
+from .common import load_results
+
+# (metric, True if higher is better)
+METRICS = [
+    ('throughput_per_second', True),
+    ('p50_ms', False),
+    ('p99_ms', False),
+    ('peak_rss_mb', False),
+    ('peak_child_rss_mb', False),
+]
+
+
+def load(path: str) -> Dict[str, Dict[str, Any]]:
+    return {r['name']: r for r in load_results(path)}
+
+
+def compare(baseline: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]],
+            threshold: float) -> Tuple[List[str], List[str]]:
+    """Return report lines and the subset describing regressions."""
+    lines: List[str] = []
+    regressions: List[str] = []
+    for name in sorted(set(baseline) & set(current)):
+        for metric, higher_is_better in METRICS:
+            old, new = baseline[name].get(metric), current[name].get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            worse = -change if higher_is_better else change
+            line = f"{name:<40} {metric:<22} {old:>12.2f} -> {new:>12.2f} ({change:+.1f}%)"
+            if worse > threshold:
+                line += '  REGRESSION'
+                regressions.append(line)
+            lines.append(line)
+    for name in sorted(set(baseline) ^ set(current)):
+        lines.append(f"{name:<40} only in {'baseline' if name in baseline else 'current'}")
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare benchmark results between runs')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Percent change counted as a regression')
+    args = parser.parse_args()
+
+    lines, regressions = compare(load(args.baseline), load(args.current), args.threshold)
+    print('\n'.join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold}%")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
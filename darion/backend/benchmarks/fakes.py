@@ -0,0 +1,227 @@
+"""
+Local fake servers for Microsoft Graph, TimeTree, Gmail and OpenAI.
+
+Each fake runs an HTTP server on 127.0.0.1 in a background thread and
+sleeps for a configurable latency before answering, so benchmarks
+measure our code plus a controlled network delay. fake_services()
+points Config and the openai client at the fakes and swaps MSAL for a
+client that hands out a static token, since MSAL requires a real HTTPS
+authority.
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Callable, List, Optional, Tuple
+import openai
+from config import Config
+from modules import integrations
+
+Route = Tuple[str, re.Pattern, Callable[[re.Match, Optional[Dict[str, Any]]], Dict[str, Any]]]
+
+
+class FakeServer:
+    def __init__(self, name: str, routes: List[Route], latency: float = 0.0):
+        self.name = name
+        self.routes = routes
+        self.latency = latency
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name=f"fake-{name}", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body are written separately; without this, Nagle plus
+            # delayed ACKs add ~40ms per keep-alive request
+            disable_nagle_algorithm = True
+
+            def _dispatch(self, method: str):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                path = self.path.split('?', 1)[0]
+                with server._count_lock:
+                    server.request_count += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                for route_method, pattern, handler in server.routes:
+                    match = pattern.fullmatch(path)
+                    if route_method == method and match:
+                        payload = json.dumps(handler(match, body)).encode()
+                        self.send_response(200)
+                        break
+                else:
+                    payload = json.dumps({'error': f"No fake route for {method} {path}"}).encode()
+                    self.send_response(404)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._dispatch('GET')
+
+            def do_POST(self):
+                self._dispatch('POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'FakeServer':
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def graph_server(latency: float, items: int = 25) -> FakeServer:
+    """Fake Microsoft Graph serving mail, events and drive listings."""
+    messages = {'value': [{'id': str(i), 'subject': f"Message {i}"} for i in range(items)]}
+    events = {'value': [{'id': str(i), 'subject': f"Event {i}"} for i in range(items)]}
+    drive = {'value': [{'id': str(i), 'name': f"file_{i}.docx"} for i in range(items)]}
+    return FakeServer('graph', [
+        ('GET', re.compile(r'/me/messages'), lambda m, b: messages),
+        ('GET', re.compile(r'/me/events'), lambda m, b: events),
+        ('GET', re.compile(r'/me/drive/root/children'), lambda m, b: drive),
+    ], latency)
+
+
+def timetree_server(latency: float, items: int = 25) -> FakeServer:
+    """Fake TimeTree serving upcoming events."""
+    events = {'data': [{'id': str(i), 'type': 'event', 'attributes': {'title': f"Event {i}"}}
+                       for i in range(items)]}
+    return FakeServer('timetree', [
+        ('GET', re.compile(r'/calendars/[^/]+/upcoming_events'), lambda m, b: events),
+    ], latency)
+
+
+def gmail_server(latency: float, items: int = 25) -> FakeServer:
+    """Fake Gmail REST API serving message listings and messages."""
+    listing = {'messages': [{'id': str(i), 'threadId': str(i)} for i in range(items)]}
+    return FakeServer('gmail', [
+        ('GET', re.compile(r'/gmail/v1/users/[^/]+/messages'), lambda m, b: listing),
+        ('GET', re.compile(r'/gmail/v1/users/[^/]+/messages/([^/]+)'),
+         lambda m, b: {'id': m.group(1), 'snippet': f"Message {m.group(1)}"}),
+    ], latency)
+
+
+def openai_server(latency: float) -> FakeServer:
+    """Fake OpenAI chat completions endpoint."""
+    def complete(match, body):
+        return {
+            'id': 'chatcmpl-fake',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': (body or {}).get('model', 'gpt-3.5-turbo'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': 'intent: general_query'},
+                'finish_reason': 'stop',
+            }],
+            'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2},
+        }
+    return FakeServer('openai', [
+        ('POST', re.compile(r'/v1/chat/completions'), complete),
+    ], latency)
+
+
+class FakeConfidentialClientApplication:
+    """Stands in for msal.ConfidentialClientApplication with a static token."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def acquire_token_silent(self, scopes, account=None):
+        return None
+
+    def acquire_token_for_client(self, scopes):
+        return {'access_token': 'fake-token', 'token_type': 'Bearer', 'expires_in': 3600}
+
+
+@contextmanager
+def fake_services(latency: Optional[Dict[str, float]] = None, items: int = 25):
+    """
+    Start every fake and point the application at them for the duration.
+
+    Args:
+        latency: Seconds of latency per service ('graph', 'timetree',
+            'gmail', 'openai'); missing services get none
+        items: Number of records each listing endpoint returns
+    """
+    latency = latency or {}
+    servers = {
+        'graph': graph_server(latency.get('graph', 0.0), items).start(),
+        'timetree': timetree_server(latency.get('timetree', 0.0), items).start(),
+        'gmail': gmail_server(latency.get('gmail', 0.0), items).start(),
+        'openai': openai_server(latency.get('openai', 0.0)).start(),
+    }
+    saved = {
+        'MS_GRAPH_ENDPOINT': Config.MS_GRAPH_ENDPOINT,
+        'TIMETREE_API_ENDPOINT': Config.TIMETREE_API_ENDPOINT,
+        'TIMETREE_CALENDAR_ID': Config.TIMETREE_CALENDAR_ID,
+        'OPENAI_API_KEY': Config.OPENAI_API_KEY,
+    }
+    saved_api_base = openai.api_base
+    saved_msal = integrations.ConfidentialClientApplication
+    try:
+        Config.MS_GRAPH_ENDPOINT = servers['graph'].url
+        Config.TIMETREE_API_ENDPOINT = servers['timetree'].url
+        Config.TIMETREE_CALENDAR_ID = Config.TIMETREE_CALENDAR_ID or 'fake-calendar'
+        Config.OPENAI_API_KEY = Config.OPENAI_API_KEY or 'fake-key'
+        openai.api_base = f"{servers['openai'].url}/v1"
+        integrations.ConfidentialClientApplication = FakeConfidentialClientApplication
+        yield servers
+    finally:
+        for name, value in saved.items():
+            setattr(Config, name, value)
+        openai.api_base = saved_api_base
+        integrations.ConfidentialClientApplication = saved_msal
+        for server in servers.values():
+            server.stop()
+
+
+# Handlers swallow integration errors and report them in their response text
+FAILURE_MARKERS = ('Failed', 'encountered an error')
+
+
+def request_counts(servers: Dict[str, FakeServer]) -> Dict[str, int]:
+    """Snapshot of how many requests each fake has served."""
+    return {name: server.request_count for name, server in servers.items()}
+
+
+def check_fakes_hit(servers: Dict[str, FakeServer], before: Dict[str, int], names, minimum: int,
+                    label: str) -> None:
+    """Fail if any expected fake saw fewer than minimum requests since before."""
+    for name in names:
+        hits = servers[name].request_count - before[name]
+        if hits < minimum:
+            raise RuntimeError(f"{label} made {hits} requests to the {name} fake, expected at least {minimum}")
+
+
+def add_latency_arguments(parser: argparse.ArgumentParser) -> None:
+    """Per-service fake latency options shared by the integration benchmarks."""
+    for service in ('graph', 'timetree', 'gmail', 'openai'):
+        parser.add_argument(f"--{service}-latency-ms", type=float, default=0.0)
+    parser.add_argument('--items', type=int, default=25, help='Records per fake listing response')
+
+
+def latency_from_args(args: argparse.Namespace) -> Dict[str, float]:
+    return {service: getattr(args, f"{service}_latency_ms") / 1000.0
+            for service in ('graph', 'timetree', 'gmail', 'openai')}
@@ -0,0 +1,85 @@
+"""
+Run the benchmark suite and save results for comparison.
+
+Run from darion/backend:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --suites sync agent --openai-latency-ms 300 --graph-latency-ms 80
+    python -m benchmarks.compare baseline.json results.json
+
+Integration benchmarks run against the local fakes in benchmarks/fakes.py,
+so no credentials or network access are needed. Each benchmark runs in a
+fresh process so its peak RSS is its own, not the high-water mark of
+whatever ran before it.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Any, List, Tuple
+from .bench_sync import TARGETS
+from .common import load_results, print_results, write_results
+from .fakes import add_latency_arguments
+
+SUITES = ['file_manager', 'agent', 'sync', 'billing']
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_jobs(args: argparse.Namespace) -> List[Tuple[str, List[str]]]:
+    """One (module, argv) pair per benchmark result."""
+    latency = []
+    for service in ('graph', 'timetree', 'gmail', 'openai'):
+        latency += [f"--{service}-latency-ms", str(getattr(args, f"{service}_latency_ms"))]
+    latency += ['--items', str(args.items)]
+
+    jobs: List[Tuple[str, List[str]]] = []
+    if 'file_manager' in args.suites:
+        jobs += [('bench_file_manager', ['--files', str(files)]) for files in args.files]
+    if 'agent' in args.suites:
+        jobs.append(('bench_agent', ['--queries', str(args.queries)] + latency))
+    if 'sync' in args.suites:
+        jobs += [('bench_sync', ['--targets', target, '--requests', str(args.requests),
+                                 '--concurrency', str(args.concurrency)] + latency)
+                 for target in TARGETS]
+    if 'billing' in args.suites:
+        jobs.append(('bench_billing', ['--documents', str(args.documents)]))
+    return jobs
+
+
+def run_job(module: str, argv: List[str]) -> List[Dict[str, Any]]:
+    """Run one benchmark module in a subprocess and return its results."""
+    fd, json_path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        subprocess.run([sys.executable, '-m', f"benchmarks.{module}", *argv, '--json', json_path],
+                       cwd=BACKEND_DIR, check=True, stdout=subprocess.DEVNULL)
+        return load_results(json_path)
+    finally:
+        os.remove(json_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the Darion benchmark suite')
+    parser.add_argument('--suites', nargs='+', choices=SUITES, default=SUITES)
+    parser.add_argument('--output', help='Write results as JSON to this path')
+    parser.add_argument('--files', type=int, nargs='+', default=[10000],
+                        help='Synthetic tree sizes for file_manager, e.g. 10000 100000 1000000')
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=200, help='Requests per sync endpoint')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--documents', type=int, default=2000)
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    for module, argv in build_jobs(args):
+        results.extend(run_job(module, argv))
+
+    print_results(results)
+    if args.output:
+        write_results(results, args.output)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -46,6 +46,26 @@ class Config:
     # Logging Configuration
     LOG_LEVEL = os.environ.get('LOG_LEVEL') or 'INFO'
     
+    # Billing Configuration
+    BILLING_TEMPLATE_DIR = os.environ.get('BILLING_TEMPLATE_DIR') or os.path.join(os.path.dirname(__file__), 'templates', 'billing')
+    BILLING_OUTPUT_DIR = os.environ.get('BILLING_OUTPUT_DIR') or os.path.join(os.path.dirname(__file__), 'output', 'billing')
+    BILLING_WORKERS = int(os.environ.get('BILLING_WORKERS') or os.cpu_count() or 1)
+    BILLING_BATCH_SIZE = int(os.environ.get('BILLING_BATCH_SIZE') or 200)
+    BILLING_TAX_RATE = float(os.environ.get('BILLING_TAX_RATE') or 0.0)
+    
+    # Inventory Configuration
+    INVENTORY_DB_PATH = os.environ.get('INVENTORY_DB_PATH') or os.path.join(os.path.dirname(__file__), 'data', 'inventory.db')
+    INVENTORY_CACHE_SIZE = int(os.environ.get('INVENTORY_CACHE_SIZE') or 10000)
+    
+    # Certificate Package Configuration
+    CERTIFICATE_STORE_DIR = os.environ.get('CERTIFICATE_STORE_DIR') or os.path.join(os.path.dirname(__file__), 'data', 'certificates')
+    CERTIFICATE_CACHE_SIZE = int(os.environ.get('CERTIFICATE_CACHE_SIZE') or 64)
+    
+    # Profiling Configuration
+    PROFILING_ENABLED = (os.environ.get('PROFILING_ENABLED') or '').lower() in ('1', 'true', 'yes')
+    PROFILING_INTERVAL = float(os.environ.get('PROFILING_INTERVAL') or 0.005)
+    PROFILING_OUTPUT_DIR = os.environ.get('PROFILING_OUTPUT_DIR') or os.path.join(os.path.dirname(__file__), 'output', 'profiles')
+    
     # Cache Configuration
     CACHE_TIMEOUT = int(os.environ.get('CACHE_TIMEOUT') or 300)  # 5 minutes default
     
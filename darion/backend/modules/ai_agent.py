@@ -2,6 +2,7 @@ import logging
 from typing import Dict, Any, Optional, List
 import openai
 from .logger import setup_logger
+from .metrics import LLM_LATENCY, track_latency
 from .integrations import MicrosoftIntegration, TimeTreeIntegration, GmailIntegration
 from .file_manager import FileManager
 from config import Config
@@ -32,12 +33,13 @@ class UnifiedAgent:
     def _get_ai_response(self, messages: List[Dict[str, str]]) -> str:
         """Get response from OpenAI API."""
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=messages,
-                temperature=0.7,
-                max_tokens=150
-            )
+            with track_latency(LLM_LATENCY, model="gpt-3.5-turbo"):
+                response = openai.ChatCompletion.create(
+                    model="gpt-3.5-turbo",
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=150
+                )
             return response.choices[0].message.content
         except Exception as e:
             logger.error(f"Failed to get AI response: {str(e)}")
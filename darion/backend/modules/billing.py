@@ -1,14 +1,320 @@
-def generate_invoice():
-    """Generate an invoice."""
-    # Implementation will go here
-    pass
-
-def generate_purchase_order():
-    """Generate a purchase order."""
-    # Implementation will go here
-    pass
-
-def generate_sales_order():
-    """Generate a sales order."""
-    # Implementation will go here
-    pass
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Tuple, Union
+import pandas as pd
+from jinja2 import Environment, ChoiceLoader, DictLoader, FileSystemLoader, select_autoescape
+from config import Config
+from .logger import setup_logger
+
+try:
+    # Optional PDF extra: pip install weasyprint (needs the pango/cairo system libraries)
+    from weasyprint import HTML
+except ImportError:
+    HTML = None
+
+logger = setup_logger()
+
+DOCUMENT_TYPES = {
+    'invoice': {'title': 'Invoice', 'party_label': 'Bill To'},
+    'purchase_order': {'title': 'Purchase Order', 'party_label': 'Supplier'},
+    'sales_order': {'title': 'Sales Order', 'party_label': 'Customer'},
+}
+
+REQUIRED_COLUMNS = ['document_number', 'party', 'date', 'description', 'quantity', 'unit_price']
+
+_BASE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{{ title }} {{ doc.document_number }}</title>
+<style>
+body { font-family: Helvetica, Arial, sans-serif; font-size: 12px; }
+table { width: 100%; border-collapse: collapse; }
+th, td { border-bottom: 1px solid #ddd; padding: 4px; text-align: left; }
+td.num, th.num { text-align: right; }
+</style>
+</head>
+<body>
+<h1>{{ title }} #{{ doc.document_number }}</h1>
+<p>Date: {{ doc.date }}</p>
+<p>{{ party_label }}: {{ doc.party }}</p>
+<table>
+<tr><th>Description</th><th class="num">Qty</th><th class="num">Unit Price</th><th class="num">Amount</th></tr>
+{% for line in doc.lines %}<tr><td>{{ line.description }}</td><td class="num">{{ line.quantity }}</td><td class="num">{{ '%.2f'|format(line.unit_price) }}</td><td class="num">{{ '%.2f'|format(line.line_total) }}</td></tr>
+{% endfor %}</table>
+<p>Subtotal: {{ '%.2f'|format(doc.subtotal) }}</p>
+<p>Tax: {{ '%.2f'|format(doc.tax) }}</p>
+<p><strong>Total: {{ '%.2f'|format(doc.total) }}</strong></p>
+</body>
+</html>
+"""
+
+# Built-in templates, overridable by dropping <doc_type>.html into BILLING_TEMPLATE_DIR
+DEFAULT_TEMPLATES = {f"{doc_type}.html": _BASE_TEMPLATE for doc_type in DOCUMENT_TYPES}
+
+
+@lru_cache(maxsize=None)
+def _get_environment(template_dir: Optional[str]) -> Environment:
+    """Build the Jinja environment once per process."""
+    loaders = [DictLoader(DEFAULT_TEMPLATES)]
+    if template_dir and os.path.isdir(template_dir):
+        loaders.insert(0, FileSystemLoader(template_dir))
+    return Environment(loader=ChoiceLoader(loaders), autoescape=select_autoescape(['html']))
+
+
+@lru_cache(maxsize=None)
+def get_template(doc_type: str, template_dir: Optional[str] = None):
+    """Compile the template for a document type once and cache it."""
+    if doc_type not in DOCUMENT_TYPES:
+        raise ValueError(f"Unsupported document type. Supported: {list(DOCUMENT_TYPES)}")
+    return _get_environment(template_dir).get_template(f"{doc_type}.html")
+
+
+def _iter_row_chunks(source: Union[str, Iterable[Dict[str, Any]]], chunksize: int) -> Iterator[pd.DataFrame]:
+    """Stream line items from a CSV path or an iterable of row dicts as DataFrame chunks."""
+    if isinstance(source, (str, os.PathLike)):
+        # Read document numbers as text so every chunk agrees on their type
+        # and values like 0007 and 007 stay distinct
+        with pd.read_csv(source, chunksize=chunksize, dtype={'document_number': str}) as reader:
+            yield from reader
+        return
+    rows = iter(source)
+    while True:
+        chunk = list(islice(rows, chunksize))
+        if not chunk:
+            return
+        yield pd.DataFrame.from_records(chunk)
+
+
+def compute_totals(lines: pd.DataFrame, default_tax_rate: float) -> List[Dict[str, Any]]:
+    """Compute line, subtotal, tax and grand totals for every document in a frame at once."""
+    missing = [column for column in REQUIRED_COLUMNS if column not in lines.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+    lines = lines.copy()
+    if 'tax_rate' not in lines.columns:
+        lines['tax_rate'] = default_tax_rate
+    lines['tax_rate'] = lines['tax_rate'].fillna(default_tax_rate)
+    lines['line_total'] = lines['quantity'] * lines['unit_price']
+    lines['line_tax'] = lines['line_total'] * lines['tax_rate']
+
+    grouped = lines.groupby('document_number', sort=False)
+    summary = grouped.agg(
+        party=('party', 'first'),
+        date=('date', 'first'),
+        subtotal=('line_total', 'sum'),
+        tax=('line_tax', 'sum'),
+    )
+    summary['total'] = summary['subtotal'] + summary['tax']
+
+    line_columns = ['description', 'quantity', 'unit_price', 'line_total']
+    documents = []
+    for document_number, group in grouped:
+        header = summary.loc[document_number]
+        documents.append({
+            'document_number': document_number,
+            'party': header['party'],
+            'date': header['date'],
+            'lines': group[line_columns].to_dict('records'),
+            'subtotal': float(header['subtotal']),
+            'tax': float(header['tax']),
+            'total': float(header['total']),
+        })
+    return documents
+
+
+def iter_document_batches(source: Union[str, Iterable[Dict[str, Any]]], batch_size: int,
+                          default_tax_rate: float = 0.0) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream documents in batches with totals computed.
+
+    Line items for a document must be contiguous in the input; a document
+    number that reappears after another document raises ValueError rather
+    than producing a partial document. The trailing run of each chunk is
+    held back until the next chunk so documents spanning a chunk boundary
+    are not split. Document numbers are always handled as strings.
+    """
+    carry = None
+    seen = set()
+    pending: List[Dict[str, Any]] = []
+    for chunk in _iter_row_chunks(source, batch_size * 10):
+        if 'document_number' not in chunk.columns:
+            raise ValueError("Missing required columns: ['document_number']")
+        if chunk['document_number'].isna().any():
+            raise ValueError("Every line item needs a document_number")
+        chunk['document_number'] = chunk['document_number'].astype(str)
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        numbers = chunk['document_number']
+        run_ids = (numbers != numbers.shift()).cumsum()
+        tail = run_ids == run_ids.iloc[-1]
+        carry = chunk[tail]
+        complete = chunk[~tail]
+        if complete.empty:
+            continue
+
+        complete_numbers = complete['document_number']
+        run_starts = complete_numbers[complete_numbers != complete_numbers.shift()]
+        repeated = list(run_starts[run_starts.duplicated() | run_starts.isin(seen)])
+        if carry['document_number'].iloc[0] in set(run_starts):
+            repeated.append(carry['document_number'].iloc[0])
+        if repeated:
+            raise ValueError(f"Line items for document {repeated[0]} are not contiguous in the input")
+        seen.update(run_starts)
+
+        pending.extend(compute_totals(complete, default_tax_rate))
+        while len(pending) >= batch_size:
+            yield pending[:batch_size]
+            pending = pending[batch_size:]
+
+    if carry is not None and not carry.empty:
+        if carry['document_number'].iloc[0] in seen:
+            raise ValueError(f"Line items for document {carry['document_number'].iloc[0]} "
+                             f"are not contiguous in the input")
+        pending.extend(compute_totals(carry, default_tax_rate))
+    while pending:
+        yield pending[:batch_size]
+        pending = pending[batch_size:]
+
+
+def document_file_stem(doc_type: str, document_number: str) -> str:
+    """
+    File name (without extension) for a document.
+
+    Characters outside [A-Za-z0-9_.-] are replaced; when that changes the
+    number, a short hash of the raw value keeps e.g. A/1 and A_1 apart.
+    """
+    number = str(document_number)
+    safe_number = re.sub(r'[^A-Za-z0-9_.-]', '_', number)
+    if safe_number != number:
+        safe_number += '-' + hashlib.sha1(number.encode('utf-8')).hexdigest()[:8]
+    return f"{doc_type}_{safe_number}"
+
+
+def _render_batch(doc_type: str, documents: List[Dict[str, Any]], output_dir: str,
+                  output_format: str, template_dir: Optional[str]) -> Tuple[int, float]:
+    """
+    Render a batch of documents to disk. Runs inside a worker process.
+
+    Returns the number of documents rendered and the seconds it took.
+    """
+    start = time.perf_counter()
+    template = get_template(doc_type, template_dir)
+    for doc in documents:
+        html = template.render(doc=doc, **DOCUMENT_TYPES[doc_type])
+        base_path = os.path.join(output_dir, document_file_stem(doc_type, doc['document_number']))
+        if output_format == 'pdf':
+            HTML(string=html).write_pdf(f"{base_path}.pdf")
+        else:
+            with open(f"{base_path}.html", 'w', encoding='utf-8') as f:
+                f.write(html)
+    return len(documents), time.perf_counter() - start
+
+
+class BillingEngine:
+    def __init__(self, output_dir: Optional[str] = None, template_dir: Optional[str] = None,
+                 workers: Optional[int] = None, batch_size: Optional[int] = None):
+        self.output_dir = output_dir or Config.BILLING_OUTPUT_DIR
+        self.template_dir = template_dir or Config.BILLING_TEMPLATE_DIR
+        self.workers = workers or Config.BILLING_WORKERS
+        self.batch_size = batch_size or Config.BILLING_BATCH_SIZE
+        self.default_tax_rate = Config.BILLING_TAX_RATE
+        self.supported_formats = ['html', 'pdf']
+
+    def generate_documents(self, doc_type: str, source: Union[str, Iterable[Dict[str, Any]]],
+                           output_format: str = 'html') -> Dict[str, Any]:
+        """
+        Generate documents of one type from streamed line items.
+
+        Args:
+            doc_type: 'invoice', 'purchase_order' or 'sales_order'
+            source: CSV path or iterable of line item dicts
+            output_format: 'html' or 'pdf'
+
+        Returns:
+            Dictionary containing generation results and throughput statistics
+        """
+        try:
+            if doc_type not in DOCUMENT_TYPES:
+                raise ValueError(f"Unsupported document type. Supported: {list(DOCUMENT_TYPES)}")
+            if output_format not in self.supported_formats:
+                raise ValueError(f"Unsupported output format. Supported: {self.supported_formats}")
+            if output_format == 'pdf' and HTML is None:
+                raise RuntimeError("PDF output requires weasyprint to be installed")
+
+            os.makedirs(self.output_dir, exist_ok=True)
+            # Fail fast on a broken template before fanning out to workers
+            get_template(doc_type, self.template_dir)
+
+            # Render into a staging directory and publish only once the whole run
+            # succeeds, so a failed run never leaves partial documents behind
+            staging_dir = tempfile.mkdtemp(prefix='.staging-', dir=self.output_dir)
+            try:
+                start = time.perf_counter()
+                generated = 0
+                batch_seconds: List[float] = []
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    # Keep a bounded number of batches in flight so the input stays streamed
+                    in_flight = deque()
+
+                    def collect():
+                        nonlocal generated
+                        count, seconds = in_flight.popleft().result()
+                        generated += count
+                        batch_seconds.append(seconds)
+
+                    for batch in iter_document_batches(source, self.batch_size, self.default_tax_rate):
+                        if len(in_flight) >= self.workers * 2:
+                            collect()
+                        in_flight.append(executor.submit(_render_batch, doc_type, batch, staging_dir,
+                                                         output_format, self.template_dir))
+                    while in_flight:
+                        collect()
+
+                for name in os.listdir(staging_dir):
+                    os.replace(os.path.join(staging_dir, name), os.path.join(self.output_dir, name))
+                elapsed = time.perf_counter() - start
+            finally:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+            return {
+                'success': True,
+                'message': f"Successfully generated {generated} {doc_type} documents",
+                'statistics': {
+                    'documents': generated,
+                    'elapsed_seconds': elapsed,
+                    'documents_per_second': generated / elapsed if elapsed else 0.0,
+                    'batch_seconds': batch_seconds,
+                    'output_dir': self.output_dir,
+                }
+            }
+
+        except Exception as e:
+            logger.error(f"Error generating {doc_type} documents: {str(e)}")
+            return {
+                'success': False,
+                'message': f"Error generating {doc_type} documents: {str(e)}",
+                'statistics': None
+            }
+
+
+def generate_invoice(source, output_format: str = 'html', **kwargs) -> Dict[str, Any]:
+    """Generate invoices."""
+    return BillingEngine(**kwargs).generate_documents('invoice', source, output_format)
+
+def generate_purchase_order(source, output_format: str = 'html', **kwargs) -> Dict[str, Any]:
+    """Generate purchase orders."""
+    return BillingEngine(**kwargs).generate_documents('purchase_order', source, output_format)
+
+def generate_sales_order(source, output_format: str = 'html', **kwargs) -> Dict[str, Any]:
+    """Generate sales orders."""
+    return BillingEngine(**kwargs).generate_documents('sales_order', source, output_format)
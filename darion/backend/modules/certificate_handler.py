@@ -1,9 +1,243 @@
-def process_certificate_request():
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Tuple, Union, BinaryIO
+from config import Config
+from .logger import setup_logger
+
+logger = setup_logger()
+
+CHUNK_SIZE = 1024 * 1024
+PACKAGE_ID_PATTERN = re.compile(r'[A-Za-z0-9][A-Za-z0-9_.-]*')
+
+
+class PackageNotFoundError(FileNotFoundError):
+    """Raised when no manifest exists for a certificate package."""
+
+
+class CertificateStore:
+    """
+    Certificate packages backed by a content-addressed blob store.
+
+    Each file is stored once under blobs/<sha256[:2]>/<sha256>, so identical
+    certificates shared between packages are only kept once. A package is a
+    JSON manifest mapping file names to blob digests. Assembled zips are kept
+    under packages/, keyed by the manifest digest, with an LRU bound. Zips
+    checked out for a download are not deleted on eviction until released.
+    """
+
+    def __init__(self, root_dir: Optional[str] = None, cache_size: Optional[int] = None):
+        self.root_dir = root_dir or Config.CERTIFICATE_STORE_DIR
+        self.cache_size = cache_size or Config.CERTIFICATE_CACHE_SIZE
+        self.blob_dir = os.path.join(self.root_dir, 'blobs')
+        self.manifest_dir = os.path.join(self.root_dir, 'manifests')
+        self.package_dir = os.path.join(self.root_dir, 'packages')
+        for directory in (self.blob_dir, self.manifest_dir, self.package_dir):
+            os.makedirs(directory, exist_ok=True)
+
+        self._assembled: 'OrderedDict[str, str]' = OrderedDict()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._in_use: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def _manifest_path(self, package_id: str) -> str:
+        if not PACKAGE_ID_PATTERN.fullmatch(package_id):
+            raise ValueError(f"Invalid package id: {package_id}")
+        return os.path.join(self.manifest_dir, f"{package_id}.json")
+
+    def put_blob(self, source: Union[str, BinaryIO]) -> str:
+        """Stream a file into the blob store and return its SHA-256 digest."""
+        hasher = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.blob_dir)
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                stream = open(source, 'rb') if isinstance(source, str) else source
+                try:
+                    while True:
+                        chunk = stream.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        hasher.update(chunk)
+                        out.write(chunk)
+                finally:
+                    if isinstance(source, str):
+                        stream.close()
+
+            digest = hasher.hexdigest()
+            blob_path = self._blob_path(digest)
+            if os.path.exists(blob_path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.replace(tmp_path, blob_path)
+            return digest
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def save_package(self, package_id: str, files: Iterable[Tuple[str, Union[str, BinaryIO]]]) -> Dict[str, Any]:
+        """Store the files for a package and write its manifest."""
+        # Validate everything before writing any blobs so a rejected request leaves nothing behind
+        manifest_path = self._manifest_path(package_id)
+        files = [(os.path.basename(name or ''), source) for name, source in files]
+        if not files:
+            raise ValueError("No certificate files provided")
+        names = set()
+        for name, _ in files:
+            if not name:
+                raise ValueError("Certificate file name is required")
+            if name in names:
+                raise ValueError(f"Duplicate certificate file name: {name}")
+            names.add(name)
+
+        entries: List[Dict[str, str]] = [
+            {'name': name, 'sha256': self.put_blob(source)} for name, source in files
+        ]
+        fd, tmp_path = tempfile.mkstemp(dir=self.manifest_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'package_id': package_id, 'files': entries}, f)
+        os.replace(tmp_path, manifest_path)
+        return {'package_id': package_id, 'files': entries}
+
+    def load_manifest(self, package_id: str) -> Dict[str, Any]:
+        """Read a package manifest."""
+        manifest_path = self._manifest_path(package_id)
+        if not os.path.exists(manifest_path):
+            raise PackageNotFoundError(f"Certificate package not found: {package_id}")
+        with open(manifest_path) as f:
+            return json.load(f)
+
+    def _build_zip(self, manifest: Dict[str, Any], dest_path: str) -> None:
+        """Stream blobs into a zip on disk without holding the package in memory."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.package_dir)
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+                for entry in manifest['files']:
+                    with open(self._blob_path(entry['sha256']), 'rb') as src, \
+                            zf.open(entry['name'], 'w', force_zip64=True) as dst:
+                        shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            os.replace(tmp_path, dest_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get_package_path(self, package_id: str, hold: bool = False, attempts: int = 3) -> str:
+        """
+        Return the path of the assembled zip, building it only on a cache miss.
+
+        The store-wide lock only guards the LRU bookkeeping; builds run under
+        a per-package lock so a large build never blocks other downloads.
+        With hold=True the zip is kept on disk until release_package is called.
+        """
+        manifest = self.load_manifest(package_id)
+        key = hashlib.sha256(json.dumps(manifest['files'], sort_keys=True).encode()).hexdigest()
+        zip_path = os.path.join(self.package_dir, f"{key}.zip")
+
+        for _ in range(attempts):
+            with self._lock:
+                if key in self._assembled and os.path.exists(zip_path):
+                    self._assembled.move_to_end(key)
+                    if hold:
+                        self._in_use[key] = self._in_use.get(key, 0) + 1
+                    return zip_path
+                build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+            with build_lock:
+                if not os.path.exists(zip_path):
+                    self._build_zip(manifest, zip_path)
+
+            with self._lock:
+                # The zip may have been evicted since it was built; build it again if so
+                if not os.path.exists(zip_path):
+                    continue
+                self._assembled[key] = zip_path
+                self._assembled.move_to_end(key)
+                if hold:
+                    self._in_use[key] = self._in_use.get(key, 0) + 1
+                self._evict()
+                return zip_path
+        raise FileNotFoundError(f"Certificate package {package_id} was evicted while it was being built")
+
+    def release_package(self, zip_path: str) -> None:
+        """Release a zip returned by get_package_path(hold=True)."""
+        key = os.path.splitext(os.path.basename(zip_path))[0]
+        with self._lock:
+            count = self._in_use.get(key, 0) - 1
+            if count > 0:
+                self._in_use[key] = count
+                return
+            self._in_use.pop(key, None)
+            # Evicted while it was being served
+            if key not in self._assembled:
+                self._remove(zip_path)
+
+    def _evict(self) -> None:
+        """Drop least recently used zips over cache_size. Caller holds _lock."""
+        while len(self._assembled) > self.cache_size:
+            evicted_key, evicted_path = self._assembled.popitem(last=False)
+            self._build_locks.pop(evicted_key, None)
+            if evicted_key not in self._in_use:
+                self._remove(evicted_path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_store: Optional[CertificateStore] = None
+
+def get_certificate_store() -> CertificateStore:
+    """Return the shared certificate store."""
+    global _store
+    if _store is None:
+        _store = CertificateStore()
+    return _store
+
+def process_certificate_request(package_id: str, files: Iterable[Tuple[str, Union[str, BinaryIO]]]) -> Dict[str, Any]:
     """Process certificate package requests."""
-    # Implementation will go here
-    pass
+    try:
+        return get_certificate_store().save_package(package_id, files)
+    except ValueError as e:
+        logger.warning(f"Rejected certificate package {package_id!r}: {str(e)}")
+        raise
+    except Exception as e:
+        logger.error(f"Error processing certificate package {package_id}: {str(e)}")
+        raise
+
+@contextmanager
+def fetch_certificate_package(package_id: str) -> Iterator[str]:
+    """
+    Fetch the path of a certificate package zip.
 
-def fetch_certificate_package():
-    """Fetch certificate package from storage."""
-    # Implementation will go here
-    pass
+    The zip is not deleted by cache eviction until the block exits, so open
+    it (or hand it to send_file) inside the block.
+    """
+    store = get_certificate_store()
+    try:
+        zip_path = store.get_package_path(package_id, hold=True)
+    except (ValueError, PackageNotFoundError) as e:
+        logger.warning(f"Certificate package {package_id!r} not available: {str(e)}")
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching certificate package {package_id}: {str(e)}")
+        raise
+    try:
+        yield zip_path
+    finally:
+        store.release_package(zip_path)
@@ -1,11 +1,12 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import requests
 from msal import ConfidentialClientApplication
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from config import Config
 from .logger import setup_logger
+from .metrics import INTEGRATION_LATENCY, timed
 
 logger = setup_logger()
 
@@ -33,6 +34,7 @@ class MicrosoftIntegration:
             logger.error(f"Failed to get Microsoft access token: {str(e)}")
             raise
 
+    @timed(INTEGRATION_LATENCY, integration='outlook')
     def get_outlook_data(self) -> Dict[str, Any]:
         """Fetch emails and calendar events from Outlook."""
         try:
@@ -61,6 +63,7 @@ class MicrosoftIntegration:
             logger.error(f"Failed to fetch Outlook data: {str(e)}")
             raise
 
+    @timed(INTEGRATION_LATENCY, integration='onedrive')
     def get_onedrive_data(self) -> List[Dict[str, Any]]:
         """Fetch files and folders from OneDrive."""
         try:
@@ -79,9 +82,11 @@ class MicrosoftIntegration:
             raise
 
 class GmailIntegration:
-    def __init__(self, credentials: Credentials):
-        self.service = build('gmail', 'v1', credentials=credentials)
+    def __init__(self, credentials: Credentials, api_endpoint: Optional[str] = None):
+        client_options = {'api_endpoint': api_endpoint} if api_endpoint else None
+        self.service = build('gmail', 'v1', credentials=credentials, client_options=client_options)
 
+    @timed(INTEGRATION_LATENCY, integration='gmail')
     def get_gmail_data(self) -> Dict[str, Any]:
         """Fetch emails from Gmail."""
         try:
@@ -107,6 +112,7 @@ class TimeTreeIntegration:
         self.calendar_id = Config.TIMETREE_CALENDAR_ID
         self.endpoint = Config.TIMETREE_API_ENDPOINT
         
+    @timed(INTEGRATION_LATENCY, integration='timetree')
     def get_time_tree_data(self) -> Dict[str, Any]:
         """Fetch calendar events from TimeTree."""
         try:
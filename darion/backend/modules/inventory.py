@@ -1,9 +1,224 @@
-def monthly_inventory_count():
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, List, Iterable, Optional, Tuple, Union
+import pandas as pd
+from config import Config
+from .logger import setup_logger
+
+logger = setup_logger()
+
+# Bound parameters per IN query: a safe margin below SQLite's limit
+# (999 by default before 3.32, 32766 since)
+SQLITE_MAX_VARIABLES = 900
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stock (
+    sku TEXT NOT NULL,
+    location TEXT NOT NULL,
+    quantity INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (sku, location)
+);
+CREATE INDEX IF NOT EXISTS idx_stock_location ON stock (location);
+"""
+
+
+class InventoryStore:
+    def __init__(self, db_path: Optional[str] = None, cache_timeout: Optional[int] = None,
+                 cache_size: Optional[int] = None):
+        self.db_path = db_path or Config.INVENTORY_DB_PATH
+        self.cache_timeout = Config.CACHE_TIMEOUT if cache_timeout is None else cache_timeout
+        self.cache_size = cache_size or Config.INVENTORY_CACHE_SIZE
+        self._local = threading.local()
+        # LRU of (sku, location) -> (quantity, fetched_at), bounded by cache_size
+        self._cache: 'OrderedDict[Tuple[str, Optional[str]], Tuple[int, float]]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def invalidate_cache(self) -> None:
+        """Drop all cached stock levels."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def import_csv(self, csv_path: str, chunksize: int = 10000) -> Dict[str, Any]:
+        """
+        Bulk import stock levels from a CSV with sku, location and quantity columns.
+
+        Existing (sku, location) rows are overwritten.
+        """
+        try:
+            conn = self._connection()
+            now = datetime.now().isoformat()
+            imported = 0
+            with conn, pd.read_csv(csv_path, chunksize=chunksize,
+                                   dtype={'sku': str, 'location': str}) as reader:
+                for chunk in reader:
+                    missing = [c for c in ('sku', 'location', 'quantity') if c not in chunk.columns]
+                    if missing:
+                        raise ValueError(f"Missing required columns: {missing}")
+                    chunk = chunk.dropna(subset=['sku', 'location'])
+                    quantity = pd.to_numeric(chunk['quantity']).fillna(0)
+                    fractional = chunk['sku'][quantity % 1 != 0]
+                    if not fractional.empty:
+                        raise ValueError(f"Non-integral quantity for SKU {fractional.iloc[0]}")
+                    chunk['quantity'] = quantity.astype(int)
+                    rows = zip(chunk['sku'], chunk['location'], chunk['quantity'].tolist())
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO stock (sku, location, quantity, updated_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        ((sku, location, quantity, now) for sku, location, quantity in rows)
+                    )
+                    imported += len(chunk)
+            self.invalidate_cache()
+            return {'success': True, 'message': f"Successfully imported {imported} stock records"}
+        except Exception as e:
+            logger.error(f"Error importing inventory from {csv_path}: {str(e)}")
+            return {'success': False, 'message': f"Error importing inventory: {str(e)}"}
+
+    def adjust_stock(self, sku: str, location: str, delta: int) -> None:
+        """Add (or, with a negative delta, remove) stock at a location."""
+        sku, location = str(sku), str(location)
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO stock (sku, location, quantity, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (sku, location) DO UPDATE SET "
+                "quantity = quantity + excluded.quantity, updated_at = excluded.updated_at",
+                (sku, location, delta, datetime.now().isoformat())
+            )
+        with self._cache_lock:
+            self._cache.pop((sku, None), None)
+            self._cache.pop((sku, location), None)
+
+    def get_stock_levels(self, skus: Iterable[str], location: Optional[str] = None) -> Dict[str, int]:
+        """
+        Get on-hand quantity for many SKUs, optionally at a single location.
+
+        Cached levels are served from memory; the rest are fetched with one
+        grouped query per SQLITE_MAX_VARIABLES SKUs.
+        """
+        skus = list(dict.fromkeys(str(sku) for sku in skus))
+        location = None if location is None else str(location)
+        now = time.monotonic()
+        levels: Dict[str, int] = {}
+        misses: List[str] = []
+
+        with self._cache_lock:
+            for sku in skus:
+                cached = self._cache.get((sku, location))
+                if cached and now - cached[1] < self.cache_timeout:
+                    self._cache.move_to_end((sku, location))
+                    levels[sku] = cached[0]
+                else:
+                    misses.append(sku)
+
+        if misses:
+            conn = self._connection()
+            fetched = dict.fromkeys(misses, 0)
+            for i in range(0, len(misses), SQLITE_MAX_VARIABLES):
+                batch = misses[i:i + SQLITE_MAX_VARIABLES]
+                placeholders = ','.join('?' * len(batch))
+                query = f"SELECT sku, SUM(quantity) FROM stock WHERE sku IN ({placeholders})"
+                params: List[Any] = list(batch)
+                if location is not None:
+                    query += " AND location = ?"
+                    params.append(location)
+                query += " GROUP BY sku"
+                for sku, quantity in conn.execute(query, params):
+                    fetched[sku] = quantity or 0
+
+            with self._cache_lock:
+                for sku, quantity in fetched.items():
+                    self._cache[(sku, location)] = (quantity, now)
+                    self._cache.move_to_end((sku, location))
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            levels.update(fetched)
+
+        return levels
+
+    def check_availability(self, items: Union[Dict[str, int], Iterable[Tuple[str, int]]],
+                           location: Optional[str] = None) -> Dict[str, Any]:
+        """Check a whole order's lines against stock in a single batched lookup."""
+        required: Dict[str, int] = {}
+        for sku, quantity in (items.items() if isinstance(items, dict) else items):
+            sku = str(sku)
+            required[sku] = required.get(sku, 0) + quantity
+
+        levels = self.get_stock_levels(required, location)
+        shortages = {
+            sku: {'required': quantity, 'available': levels[sku]}
+            for sku, quantity in required.items()
+            if levels[sku] < quantity
+        }
+        return {
+            'available': not shortages,
+            'shortages': shortages,
+            'checked_skus': len(required)
+        }
+
+    def monthly_count(self, period: Optional[str] = None) -> Dict[str, Any]:
+        """Summarize stock per location with one aggregate query."""
+        rows = self._connection().execute(
+            "SELECT location, COUNT(*), SUM(quantity) FROM stock GROUP BY location ORDER BY location"
+        ).fetchall()
+        locations = {
+            location: {'skus': sku_count, 'total_quantity': total or 0}
+            for location, sku_count, total in rows
+        }
+        return {
+            'period': period or datetime.now().strftime('%Y-%m'),
+            'locations': locations,
+            'total_quantity': sum(l['total_quantity'] for l in locations.values()),
+            'stock_records': sum(l['skus'] for l in locations.values())
+        }
+
+
+_store: Optional[InventoryStore] = None
+
+def get_inventory_store() -> InventoryStore:
+    """Return the shared inventory store."""
+    global _store
+    if _store is None:
+        _store = InventoryStore()
+    return _store
+
+def monthly_inventory_count(period: Optional[str] = None) -> Dict[str, Any]:
     """Perform monthly inventory count."""
-    # Implementation will go here
-    pass
+    try:
+        return get_inventory_store().monthly_count(period)
+    except Exception as e:
+        logger.error(f"Error performing monthly inventory count: {str(e)}")
+        raise
 
-def check_stock_availability():
+def check_stock_availability(items, location: Optional[str] = None) -> Dict[str, Any]:
     """Check if required items are available in inventory."""
-    # Implementation will go here
-    pass
+    try:
+        return get_inventory_store().check_availability(items, location)
+    except Exception as e:
+        logger.error(f"Error checking stock availability: {str(e)}")
+        raise
@@ -1,11 +1,34 @@
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from config import Config
+
+_listener = None
 
 def setup_logger():
-    """Set up the logger for the application."""
+    """
+    Set up the logger for the application.
+
+    Safe to call from every module: handlers are attached only once. Records
+    are put on a queue and written by a background listener thread so
+    request threads never block on stream I/O.
+    """
+    global _listener
     logger = logging.getLogger('darion')
-    logger.setLevel(logging.INFO)
+    if _listener is not None:
+        return logger
+
+    level = logging.getLevelName(str(Config.LOG_LEVEL).upper())
+    logger.setLevel(level if isinstance(level, int) else logging.INFO)
     handler = logging.StreamHandler()
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
+
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    logger.propagate = False
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
     return logger
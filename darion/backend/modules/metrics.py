@@ -0,0 +1,134 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Any, List, Optional, Tuple
+from flask import g, request
+from .logger import setup_logger
+
+logger = setup_logger()
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Thread-safe latency histogram with Prometheus-style cumulative buckets."""
+
+    def __init__(self, name: str, description: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation for the given label set."""
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+                self._series[key] = series
+            series['counts'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self) -> List[str]:
+        """Render the histogram in Prometheus text exposition format."""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: {'counts': list(s['counts']), 'sum': s['sum'], 'count': s['count']}
+                      for key, s in self._series.items()}
+        for key, s in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), s['counts']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {s['sum']}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {s['count']}")
+        return lines
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape_label(v)}"' for k, v in key) + '}'
+
+
+REQUEST_LATENCY = Histogram('darion_http_request_duration_seconds', 'HTTP request latency by endpoint.')
+INTEGRATION_LATENCY = Histogram('darion_integration_call_duration_seconds', 'External integration call latency.')
+LLM_LATENCY = Histogram('darion_llm_call_duration_seconds', 'LLM API call latency.')
+
+REGISTRY = [REQUEST_LATENCY, INTEGRATION_LATENCY, LLM_LATENCY]
+
+
+@contextmanager
+def track_latency(histogram: Histogram, **labels: str):
+    """Time the enclosed block and record it, tagging failures with status="error"."""
+    start = time.perf_counter()
+    status = 'ok'
+    try:
+        yield
+    except Exception:
+        status = 'error'
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - start, status=status, **labels)
+
+
+def timed(histogram: Histogram, **labels: str):
+    """Decorator form of track_latency."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with track_latency(histogram, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render_metrics() -> str:
+    """Render all registered metrics in Prometheus text format."""
+    lines: List[str] = []
+    for histogram in REGISTRY:
+        lines.extend(histogram.render())
+    return '\n'.join(lines) + '\n'
+
+
+def init_app(app, profiler: Optional[Any] = None) -> None:
+    """Register per-request latency tracking (and optional profiling) on a Flask app."""
+    @app.before_request
+    def _start_timer():
+        g.request_start = time.perf_counter()
+        if profiler is not None:
+            g.profile_session = profiler.maybe_start(request)
+
+    @app.after_request
+    def _record_latency(response):
+        start = g.pop('request_start', None)
+        if start is not None:
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - start,
+                endpoint=request.endpoint or 'unmatched',
+                method=request.method,
+                status=str(response.status_code)
+            )
+        return response
+
+    @app.teardown_request
+    def _stop_profiler(exc):
+        session = g.pop('profile_session', None)
+        if session is not None:
+            try:
+                session.stop_and_dump(request.endpoint or 'unmatched')
+            except Exception as e:
+                logger.error(f"Failed to dump request profile: {str(e)}")
@@ -0,0 +1,88 @@
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import Optional
+from config import Config
+from .logger import setup_logger
+
+logger = setup_logger()
+
+PROFILE_FLAG_VALUES = ('1', 'true')
+
+
+class ProfileSession:
+    """Samples one thread's stack on a background thread until stopped."""
+
+    def __init__(self, thread_id: int, interval: float, output_dir: str):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.output_dir = output_dir
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name='darion-profiler', daemon=True)
+        self._started = time.perf_counter()
+        self._sampler.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = ';'.join(
+                f"{os.path.basename(f.filename)}:{f.name}:{f.lineno}"
+                for f in traceback.extract_stack(frame)
+            )
+            self.samples[stack] += 1
+
+    def stop_and_dump(self, label: str, top: int = 20) -> Optional[str]:
+        """
+        Stop sampling and write the stacks in collapsed format (one
+        "frame;frame;frame count" line per stack, flamegraph-compatible).
+        """
+        self._stop.set()
+        self._sampler.join()
+        elapsed = time.perf_counter() - self._started
+        if not self.samples:
+            return None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{label}-{int(time.time() * 1000)}.folded")
+        with open(path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        total = sum(self.samples.values())
+        hottest = '\n'.join(
+            f"  {count / total:6.1%}  {stack.rsplit(';', 1)[-1]}"
+            for stack, count in self.samples.most_common(top)
+        )
+        logger.info(f"Profiled {label} for {elapsed:.3f}s ({total} samples), written to {path}\n{hottest}")
+        return path
+
+
+class SamplingProfiler:
+    """
+    Opt-in per-request sampling profiler.
+
+    Disabled unless PROFILING_ENABLED is set; when enabled, a request is
+    profiled only if its X-Darion-Profile header or ?profile= query
+    parameter is '1' or 'true'.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, interval: Optional[float] = None,
+                 output_dir: Optional[str] = None):
+        self.enabled = Config.PROFILING_ENABLED if enabled is None else enabled
+        self.interval = interval or Config.PROFILING_INTERVAL
+        self.output_dir = output_dir or Config.PROFILING_OUTPUT_DIR
+
+    def maybe_start(self, request) -> Optional[ProfileSession]:
+        """Start sampling the current thread if profiling was requested."""
+        if not self.enabled:
+            return None
+        flags = (request.headers.get('X-Darion-Profile'), request.args.get('profile'))
+        if not any((flag or '').lower() in PROFILE_FLAG_VALUES for flag in flags):
+            return None
+        return ProfileSession(threading.get_ident(), self.interval, self.output_dir)
@@ -0,0 +1,61 @@
+import pytest
+from benchmarks import bench_agent, bench_billing
+from benchmarks.common import MIN_PERCENTILE_SAMPLES, percentile, summarize
+from benchmarks.compare import compare
+from benchmarks.fakes import check_fakes_hit, fake_services, request_counts
+from modules.ai_agent import UnifiedAgent
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_summarize_leaves_out_percentiles_of_too_few_samples():
+    few = summarize('few', [1.0] * (MIN_PERCENTILE_SAMPLES - 1), 4, 4.0)
+    assert 'p50_ms' not in few and 'p99_ms' not in few
+    enough = summarize('enough', [0.001] * MIN_PERCENTILE_SAMPLES, 5, 0.005)
+    assert enough['p50_ms'] == enough['p99_ms'] == 1.0
+
+
+def test_compare_flags_regressions_and_skips_missing_metrics():
+    baseline = {'a': {'throughput_per_second': 100.0, 'p99_ms': 10.0}}
+    current = {'a': {'throughput_per_second': 80.0}, 'b': {'throughput_per_second': 1.0}}
+    lines, regressions = compare(baseline, current, threshold=10)
+    assert len(regressions) == 1 and 'throughput_per_second' in regressions[0]
+    assert not any('p99_ms' in line for line in lines)
+    assert any('only in current' in line for line in lines)
+
+
+def test_check_fakes_hit_fails_when_a_fake_was_skipped():
+    with fake_services() as servers:
+        before = request_counts(servers)
+        check_fakes_hit(servers, before, ('graph',), 0, 'nothing')
+        with pytest.raises(RuntimeError, match='graph fake'):
+            check_fakes_hit(servers, before, ('graph',), 1, 'nothing')
+
+
+def test_agent_benchmark_exercises_every_fake():
+    result = bench_agent.run(len(bench_agent.QUERIES), {})
+    assert result['operations'] == len(bench_agent.QUERIES)
+
+
+def test_agent_benchmark_fails_on_swallowed_errors(monkeypatch):
+    monkeypatch.setattr(UnifiedAgent, '_sync_outlook', lambda self, params: 'Failed to sync Outlook data.')
+    with pytest.raises(RuntimeError, match='sync outlook'):
+        bench_agent.run(len(bench_agent.QUERIES), {})
+
+
+def test_agent_benchmark_fails_when_a_sync_never_reaches_its_fake(monkeypatch):
+    monkeypatch.setattr(UnifiedAgent, '_sync_calendar', lambda self, params: 'Synced 0 events.')
+    with pytest.raises(RuntimeError, match='timetree fake'):
+        bench_agent.run(len(bench_agent.QUERIES), {})
+
+
+def test_billing_benchmark_reports_per_batch_latencies():
+    result = bench_billing.run(MIN_PERCENTILE_SAMPLES * 2, 2, 'invoice', 'html', workers=1, batch_size=2)
+    assert result['operations'] == MIN_PERCENTILE_SAMPLES * 2
+    assert result['p50_ms'] < result['elapsed_seconds'] * 1000
@@ -0,0 +1,71 @@
+import os
+import pytest
+from modules.billing import BillingEngine, document_file_stem, iter_document_batches
+
+HEADER = 'document_number,party,date,description,quantity,unit_price\n'
+
+
+def line(number, quantity=1, unit_price=2.0):
+    return {'document_number': number, 'party': 'Acme', 'date': '2024-01-31',
+            'description': 'Widget', 'quantity': quantity, 'unit_price': unit_price}
+
+
+def documents(source, batch_size=1):
+    return [doc for batch in iter_document_batches(source, batch_size) for doc in batch]
+
+
+def test_document_spanning_chunks_is_not_split():
+    rows = [line(n) for n in range(100) for _ in range(7)]
+    docs = documents(rows, batch_size=3)
+    assert len(docs) == 100
+    assert all(len(doc['lines']) == 7 and doc['total'] == 14.0 for doc in docs)
+
+
+def test_non_contiguous_lines_raise():
+    with pytest.raises(ValueError, match='not contiguous'):
+        documents([line(n % 2) for n in range(50)])
+
+
+def test_non_contiguous_lines_across_chunks_raise():
+    rows = [line(0)] * 5 + [line(1)] * 30 + [line(0)] * 2
+    with pytest.raises(ValueError, match='not contiguous'):
+        documents(rows)
+
+
+def test_csv_document_numbers_keep_one_type_across_chunks(tmp_path):
+    # batch_size=1 reads 10-row chunks: document 9 straddles the boundary and
+    # A1 only appears in the second chunk
+    rows = [f"{n},Acme,2024-01-31,Widget,1,2.0\n" for n in range(9)]
+    rows += ["9,Acme,2024-01-31,Widget,1,2.0\n"] * 2 + ["A1,Acme,2024-01-31,Widget,1,2.0\n"]
+    path = tmp_path / 'lines.csv'
+    path.write_text(HEADER + ''.join(rows))
+
+    docs = documents(str(path))
+    assert [doc['document_number'] for doc in docs] == [str(n) for n in range(10)] + ['A1']
+    assert len(docs[9]['lines']) == 2
+
+
+def test_csv_document_numbers_keep_leading_zeros(tmp_path):
+    path = tmp_path / 'lines.csv'
+    path.write_text(HEADER + '0007,Acme,2024-01-31,Widget,1,2.0\n007,Acme,2024-01-31,Widget,1,2.0\n')
+    assert [doc['document_number'] for doc in documents(str(path))] == ['0007', '007']
+
+
+def test_file_stems_do_not_collide():
+    assert document_file_stem('invoice', 'A_1') == 'invoice_A_1'
+    assert document_file_stem('invoice', 'A/1') != document_file_stem('invoice', 'A_1')
+    assert '/' not in document_file_stem('invoice', '../../evil')
+
+
+def test_failed_run_leaves_no_documents(tmp_path):
+    engine = BillingEngine(output_dir=str(tmp_path), workers=1, batch_size=1)
+    result = engine.generate_documents('invoice', [line(n % 2) for n in range(50)])
+    assert not result['success']
+    assert os.listdir(tmp_path) == []
+
+
+def test_generate_documents_writes_one_file_per_document(tmp_path):
+    engine = BillingEngine(output_dir=str(tmp_path), workers=2, batch_size=2)
+    result = engine.generate_documents('invoice', [line(n) for n in range(5) for _ in range(3)])
+    assert result['success'] and result['statistics']['documents'] == 5
+    assert sorted(os.listdir(tmp_path)) == [f"invoice_{n}.html" for n in range(5)]
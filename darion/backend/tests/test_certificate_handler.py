@@ -0,0 +1,124 @@
+import io
+import os
+import zipfile
+import pytest
+from benchmarks.fakes import FakeConfidentialClientApplication
+from modules import certificate_handler, integrations
+from modules.certificate_handler import CertificateStore, PackageNotFoundError
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CertificateStore(str(tmp_path / 'certificates'), cache_size=2)
+
+
+def files(**contents):
+    return [(name, io.BytesIO(data)) for name, data in contents.items()]
+
+
+def blob_count(store):
+    return sum(len(names) for _, _, names in os.walk(store.blob_dir))
+
+
+def test_identical_files_are_stored_once(store):
+    store.save_package('pkg1', files(a=b'shared', b=b'one'))
+    store.save_package('pkg2', files(c=b'shared'))
+    assert blob_count(store) == 2
+
+    with zipfile.ZipFile(store.get_package_path('pkg2')) as zf:
+        assert zf.read('c') == b'shared'
+
+
+@pytest.mark.parametrize('package_id', ['..', '.hidden', 'pkg\n', 'a/b', '', 'pkg 1'])
+def test_invalid_package_ids_are_rejected(store, package_id):
+    with pytest.raises(ValueError):
+        store.save_package(package_id, files(a=b'x'))
+    assert blob_count(store) == 0
+
+
+def test_duplicate_names_are_rejected_before_storing(store):
+    with pytest.raises(ValueError, match='Duplicate'):
+        store.save_package('pkg', [('dir/a', io.BytesIO(b'1')), ('a', io.BytesIO(b'2'))])
+    assert blob_count(store) == 0
+
+
+def test_missing_package(store):
+    with pytest.raises(PackageNotFoundError):
+        store.get_package_path('missing')
+
+
+def test_least_recently_used_zip_is_evicted(store):
+    for i in range(3):
+        store.save_package(f"pkg{i}", files(a=str(i).encode()))
+    first = store.get_package_path('pkg0')
+    second = store.get_package_path('pkg1')
+    store.get_package_path('pkg0')
+    store.get_package_path('pkg2')
+    assert os.path.exists(first)
+    assert not os.path.exists(second)
+    assert len(os.listdir(store.package_dir)) == 2
+
+
+def test_held_zip_survives_eviction_until_released(store):
+    for i in range(3):
+        store.save_package(f"pkg{i}", files(a=str(i).encode()))
+    held = store.get_package_path('pkg0', hold=True)
+    store.get_package_path('pkg1')
+    store.get_package_path('pkg2')
+    assert os.path.exists(held)
+
+    store.release_package(held)
+    assert not os.path.exists(held)
+
+
+def test_release_keeps_zip_that_is_still_cached(store):
+    store.save_package('pkg', files(a=b'x'))
+    held = store.get_package_path('pkg', hold=True)
+    store.release_package(held)
+    assert os.path.exists(held)
+
+
+@pytest.fixture
+def client(store, monkeypatch):
+    monkeypatch.setattr(certificate_handler, '_store', store)
+    # app builds its agent at import time, which would otherwise reach out to MSAL
+    monkeypatch.setattr(integrations, 'ConfidentialClientApplication', FakeConfidentialClientApplication)
+    import app as darion_app
+    return darion_app.app.test_client()
+
+
+def test_download_route_serves_the_zip_file(client, store):
+    response = client.post('/api/certificates/pkg', data={'files': [(io.BytesIO(b'cert'), 'a.pem')]},
+                           content_type='multipart/form-data')
+    assert response.status_code == 201
+
+    response = client.get('/api/certificates/pkg')
+    assert response.status_code == 200
+    assert int(response.headers['Content-Length']) == len(response.data)
+    assert response.headers['ETag'] and response.headers['Last-Modified']
+    assert 'pkg.zip' in response.headers['Content-Disposition']
+    assert store._in_use == {}
+    response.close()
+
+    partial = client.get('/api/certificates/pkg', headers={'Range': 'bytes=0-3'})
+    assert partial.status_code == 206 and partial.data == b'PK\x03\x04'
+    partial.close()
+
+
+def test_download_survives_eviction_of_its_zip(client, store):
+    for i in range(3):
+        store.save_package(f"pkg{i}", files(a=str(i).encode() * 1000))
+    with certificate_handler.fetch_certificate_package('pkg0') as zip_path:
+        store.get_package_path('pkg1')
+        store.get_package_path('pkg2')
+        assert os.path.exists(zip_path)
+    assert not os.path.exists(zip_path)
+
+    with client.get('/api/certificates/pkg0') as response:
+        with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+            assert zf.read('a') == b'0' * 1000
+
+
+def test_download_route_rejects_bad_ids(client):
+    assert client.get('/api/certificates/..').status_code == 404
+    assert client.get('/api/certificates/missing').status_code == 404
@@ -0,0 +1,79 @@
+import warnings
+import pytest
+from modules.inventory import InventoryStore, SQLITE_MAX_VARIABLES
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = InventoryStore(str(tmp_path / 'inventory.db'), cache_timeout=60, cache_size=100)
+    yield store
+    store.close()
+
+
+def count_queries(store):
+    """Count statements the store sends to SQLite from here on."""
+    statements = []
+    store._connection().set_trace_callback(statements.append)
+    return statements
+
+
+def test_stock_levels_sum_locations_and_filter_by_location(store):
+    store.adjust_stock('A', 'north', 5)
+    store.adjust_stock('A', 'south', 3)
+    store.adjust_stock('B', 'north', 1)
+    assert store.get_stock_levels(['A', 'B', 'missing']) == {'A': 8, 'B': 1, 'missing': 0}
+    assert store.get_stock_levels(['A'], location='south') == {'A': 3}
+
+
+def test_large_order_is_checked_in_batched_queries(store):
+    for i in range(1000):
+        store.adjust_stock(f"S{i}", 'main', 2)
+    statements = count_queries(store)
+    result = store.check_availability([(f"S{i}", 1) for i in range(1000)] + [('S0', 2)])
+    selects = [s for s in statements if s.startswith('SELECT')]
+    assert len(selects) == -(-1000 // SQLITE_MAX_VARIABLES)
+    assert result == {'available': False, 'checked_skus': 1000,
+                      'shortages': {'S0': {'required': 3, 'available': 2}}}
+
+
+def test_cached_levels_skip_the_database_until_stock_changes(store):
+    store.adjust_stock('A', 'main', 5)
+    store.get_stock_levels(['A'])
+    statements = count_queries(store)
+    assert store.get_stock_levels(['A']) == {'A': 5}
+    assert statements == []
+
+    store.adjust_stock('A', 'main', -2)
+    assert store.get_stock_levels(['A']) == {'A': 3}
+
+
+def test_cache_is_bounded(store):
+    for i in range(1000):
+        store.get_stock_levels([f"missing{i}"])
+    assert len(store._cache) == store.cache_size
+
+
+def test_int_skus_match_text_keys(store):
+    store.adjust_stock(123, 'main', 7)
+    assert store.check_availability([(123, 2)])['available']
+
+
+def test_import_csv_rejects_fractional_quantities(store, tmp_path):
+    path = tmp_path / 'stock.csv'
+    path.write_text('sku,location,quantity\n1,main,3\n2,main,2.7\n')
+    with warnings.catch_warnings():
+        # The chunked reader must be closed even though the import fails
+        warnings.simplefilter('error', ResourceWarning)
+        result = store.import_csv(str(path))
+    assert not result['success'] and 'Non-integral' in result['message']
+    assert store.get_stock_levels(['1', '2']) == {'1': 0, '2': 0}
+
+
+def test_import_csv_overwrites_and_monthly_count_aggregates(store, tmp_path):
+    path = tmp_path / 'stock.csv'
+    path.write_text('sku,location,quantity\n1,north,3\n2,north,4\n1,south,5.0\n')
+    assert store.import_csv(str(path))['success']
+    count = store.monthly_count('2024-01')
+    assert count['locations'] == {'north': {'skus': 2, 'total_quantity': 7},
+                                  'south': {'skus': 1, 'total_quantity': 5}}
+    assert count['total_quantity'] == 12
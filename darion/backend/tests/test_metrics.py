@@ -0,0 +1,105 @@
+import os
+import time
+import pytest
+from flask import Flask
+from modules import metrics
+from modules.metrics import Histogram, track_latency, timed
+from modules.profiler import SamplingProfiler
+
+
+def test_render_reports_cumulative_buckets():
+    histogram = Histogram('latency_seconds', 'Latency.', buckets=(0.5, 0.1))
+    for value in (0.05, 0.1, 0.3, 2.0):
+        histogram.observe(value, endpoint='a')
+
+    assert histogram.render() == [
+        '# HELP latency_seconds Latency.',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{endpoint="a",le="0.1"} 2',
+        'latency_seconds_bucket{endpoint="a",le="0.5"} 3',
+        'latency_seconds_bucket{endpoint="a",le="+Inf"} 4',
+        'latency_seconds_sum{endpoint="a"} 2.45',
+        'latency_seconds_count{endpoint="a"} 4',
+    ]
+
+
+def test_render_keeps_label_sets_apart_and_escapes_values():
+    histogram = Histogram('h', 'H.', buckets=(1.0,))
+    histogram.observe(0.5, path='a"b\\c\nd')
+    histogram.observe(0.5)
+    lines = histogram.render()
+    assert 'h_count 1' in lines
+    assert 'h_count{path="a\\"b\\\\c\\nd"} 1' in lines
+
+
+def test_track_latency_tags_errors():
+    histogram = Histogram('h', 'H.', buckets=(1.0,))
+    with track_latency(histogram, model='m'):
+        pass
+    with pytest.raises(RuntimeError):
+        with track_latency(histogram, model='m'):
+            raise RuntimeError('boom')
+
+    lines = histogram.render()
+    assert 'h_count{model="m",status="ok"} 1' in lines
+    assert 'h_count{model="m",status="error"} 1' in lines
+
+
+def test_timed_decorator_returns_the_result():
+    histogram = Histogram('h', 'H.', buckets=(1.0,))
+
+    @timed(histogram, integration='x')
+    def call():
+        return 42
+
+    assert call() == 42
+    assert 'h_count{integration="x",status="ok"} 1' in histogram.render()
+
+
+def test_init_app_records_request_latency(monkeypatch):
+    histogram = Histogram('requests', 'Requests.')
+    monkeypatch.setattr(metrics, 'REQUEST_LATENCY', histogram)
+    app = Flask(__name__)
+    metrics.init_app(app)
+
+    @app.route('/ping')
+    def ping():
+        return 'pong'
+
+    client = app.test_client()
+    client.get('/ping')
+    client.get('/missing')
+    lines = histogram.render()
+    assert 'requests_count{endpoint="ping",method="GET",status="200"} 1' in lines
+    assert 'requests_count{endpoint="unmatched",method="GET",status="404"} 1' in lines
+
+
+@pytest.mark.parametrize('headers, query, profiled', [
+    ({'X-Darion-Profile': '1'}, '', True),
+    ({'X-Darion-Profile': 'TRUE'}, '', True),
+    ({}, '?profile=true', True),
+    ({'X-Darion-Profile': '0'}, '', False),
+    ({'X-Darion-Profile': 'false'}, '?profile=no', False),
+    ({}, '', False),
+])
+def test_profiler_only_runs_when_requested(tmp_path, headers, query, profiled):
+    profiler = SamplingProfiler(enabled=True, interval=0.001, output_dir=str(tmp_path))
+    app = Flask(__name__)
+    with app.test_request_context(f"/ping{query}", headers=headers) as ctx:
+        session = profiler.maybe_start(ctx.request)
+    assert (session is not None) == profiled
+    if session is not None:
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        path = session.stop_and_dump('ping')
+        assert os.path.dirname(path) == str(tmp_path)
+        with open(path) as f:
+            assert 'test_metrics.py:test_profiler_only_runs_when_requested' in f.read()
+
+
+def test_profiler_disabled_ignores_flags(tmp_path):
+    profiler = SamplingProfiler(enabled=False, output_dir=str(tmp_path))
+    app = Flask(__name__)
+    with app.test_request_context('/ping', headers={'X-Darion-Profile': '1'}) as ctx:
+        assert profiler.maybe_start(ctx.request) is None